@@ -0,0 +1,284 @@
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import List, Optional
+
+from google.cloud import bigquery
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+PROJECT_ID = os.getenv("PROJECT_ID", "tpiuo-labosi")
+DBT_DATASET = os.getenv("DBT_DATASET", "stackoverflow_dbt")
+
+GOLD_TABLE = f"{PROJECT_ID}.{DBT_DATASET}.stackoverflow_questions_gold"
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SNAPSHOT_PATH = os.getenv(
+    "GOLD_SNAPSHOT_PATH",
+    os.path.join(BASE_DIR, "gold_cache", "stackoverflow_questions_gold.parquet"),
+)
+# koliko cesto (sekunde) smijemo pitati BigQuery je li se gold tablica promijenila
+CHECK_INTERVAL_S = float(os.getenv("GOLD_CHECK_INTERVAL_S", "60"))
+
+SNAPSHOT_MODIFIED_KEY = b"gold_last_modified"
+
+# stupci koje ima smisla zbrajati preko sentimenata (ostalo su prosjeci/stope)
+ADDITIVE_METRICS = ("post_count", "rolling_7d_post_count")
+
+
+def filter_dates(table: pa.Table, start: Optional[date] = None, end: Optional[date] = None) -> pa.Table:
+    """Redovi gdje je start <= report_date <= end (granice ukljucive)."""
+    # pylint: disable=no-member  # pyarrow.compute funkcije se generiraju dinamicki
+    if start is not None:
+        table = table.filter(pc.greater_equal(table["report_date"], pa.scalar(start, pa.date32())))
+    if end is not None:
+        table = table.filter(pc.less_equal(table["report_date"], pa.scalar(end, pa.date32())))
+    return table
+
+
+def rolling_window(dates: List[date], values: List, days: int, how: str, additive: bool = False) -> List:
+    """
+    Rolling prozor od `days` kalendarskih dana nad (sortiranim) dates/values.
+    NULL vrijednosti se preskacu; prozor bez ijedne vrijednosti daje None.
+
+    Mean za aditivne stupce (brojevi postova) dijeli s `days` jer dan bez reda znaci 0 postova,
+    a za prosjeke/stope dijeli s brojem ne-NULL vrijednosti u prozoru.
+    """
+    counts = [0] + list(accumulate(1 if v is not None else 0 for v in values))
+
+    window = timedelta(days=days - 1)
+    out = []
+    for i, d in enumerate(dates):
+        j = bisect_left(dates, d - window)
+        count = counts[i + 1] - counts[j]
+        if count == 0:
+            out.append(None)
+            continue
+        # svaki prozor zbrajamo posebno (fsum za float) da ne nakupljamo gresku zaokruzivanja
+        window_values = [v for v in values[j:i + 1] if v is not None]
+        if all(isinstance(v, int) for v in window_values):
+            total = sum(window_values)
+        else:
+            total = math.fsum(window_values)
+
+        if how == "sum":
+            out.append(total)
+        else:
+            out.append(total / (days if additive else count))
+    return out
+
+
+class GoldCache:
+    """
+    In-process cache gold tablice (Arrow Table, sortirano po sentiment, report_date).
+
+    - invalidacija: usporedba s `modified` metapodatkom tablice (get_table, bez query troska)
+    - start: ako postoji lokalni Parquet snapshot, ucita se odmah
+    - upiti (raspon datuma, rolling prozor) odgovaraju se iz memorije
+    """
+
+    def __init__(
+        self,
+        client: Optional[bigquery.Client] = None,
+        snapshot_path: Optional[str] = SNAPSHOT_PATH,
+        check_interval_s: float = CHECK_INTERVAL_S,
+    ):
+        self._client = client
+        self.snapshot_path = snapshot_path
+        self.check_interval_s = check_interval_s
+
+        self._lock = threading.Lock()
+        self._table: Optional[pa.Table] = None
+        self._modified: Optional[datetime] = None
+        self._last_check = 0.0
+
+        self.load_snapshot()
+
+    @property
+    def client(self) -> bigquery.Client:
+        if self._client is None:
+            self._client = bigquery.Client(project=PROJECT_ID)
+        return self._client
+
+    # ---------- snapshot ----------
+
+    def load_snapshot(self) -> bool:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+
+        try:
+            table = pq.read_table(self.snapshot_path)
+            meta = table.schema.metadata or {}
+            raw = meta.get(SNAPSHOT_MODIFIED_KEY)
+            modified = datetime.fromisoformat(raw.decode("utf-8")) if raw else None
+        except Exception as e:
+            # ostecen/nepotpun snapshot tretiramo kao da ne postoji, refresh ce ga prepisati
+            print(f"WARNING: ignoring unreadable gold snapshot {self.snapshot_path}: {e}")
+            return False
+
+        self._table = table.replace_schema_metadata(None)
+        self._modified = modified
+        print(f"Loaded gold snapshot: {self.snapshot_path} ({table.num_rows} rows, modified={self._modified})")
+        return True
+
+    def write_snapshot(self) -> None:
+        if not self.snapshot_path or self._table is None:
+            return
+
+        meta = {}
+        if self._modified is not None:
+            meta[SNAPSHOT_MODIFIED_KEY] = self._modified.isoformat().encode("utf-8")
+
+        os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+        tmp_path = f"{self.snapshot_path}.tmp"
+        pq.write_table(self._table.replace_schema_metadata(meta), tmp_path)
+        os.replace(tmp_path, self.snapshot_path)
+
+    def _remove_tmp_snapshot(self) -> None:
+        try:
+            os.remove(f"{self.snapshot_path}.tmp")
+        except OSError:
+            pass
+
+    # ---------- refresh ----------
+
+    def _fetch(self) -> pa.Table:
+        sql = f"SELECT * FROM `{GOLD_TABLE}` ORDER BY sentiment, report_date"
+        return self.client.query(sql).to_arrow()
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Provjeri last-modified gold tablice i po potrebi ponovno ucitaj podatke.
+        Vraca True ako su podaci ponovno ucitani.
+
+        Ako BigQuery nije dostupan, a u memoriji vec postoje podaci (npr. iz snapshota),
+        greska se samo ispise i nastavlja se sa starim podacima.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._table is not None and now - self._last_check < self.check_interval_s:
+                return False
+            self._last_check = now
+
+            try:
+                modified = self.client.get_table(GOLD_TABLE).modified
+                if not force and self._table is not None and modified == self._modified:
+                    return False
+                table = self._fetch()
+            except Exception as e:
+                if self._table is None:
+                    raise
+                print(f"WARNING: gold refresh failed, serving cached data (modified={self._modified}): {e}")
+                return False
+
+            self._table = table
+            self._modified = modified
+            try:
+                self.write_snapshot()
+            except Exception as e:
+                # snapshot samo ubrzava start, neuspjelo pisanje ne smije srusiti citanje
+                print(f"WARNING: could not write gold snapshot {self.snapshot_path}: {e}")
+                self._remove_tmp_snapshot()
+            print(f"Reloaded gold table: {GOLD_TABLE} ({self._table.num_rows} rows, modified={modified})")
+            return True
+
+    def table(self) -> pa.Table:
+        self.refresh()
+        return self._table
+
+    # ---------- upiti ----------
+
+    def query_range(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        sentiments: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pa.Table:
+        """Redovi gdje je start <= report_date <= end (granice ukljucive), opcionalno filtrirano po sentimentu."""
+        table = filter_dates(self.table(), start, end)
+        if sentiments is not None:
+            # pylint: disable-next=no-member
+            table = table.filter(pc.is_in(table["sentiment"], value_set=pa.array(sentiments, pa.string())))
+        if columns is not None:
+            table = table.select(columns)
+        return table
+
+    def rolling(  # pylint: disable=too-many-arguments
+        self,
+        metric: str = "post_count",
+        days: int = 7,
+        sentiment: Optional[str] = None,
+        how: str = "sum",
+        *,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> pa.Table:
+        """
+        Rolling prozor od `days` kalendarskih dana (ukljucujuci tekuci dan) nad `metric`.
+
+        Bez sentimenta metric se zbraja po danu preko svih sentimenata, sto je dozvoljeno
+        samo za ADDITIVE_METRICS.
+        how: "sum" ili "mean". Za ADDITIVE_METRICS mean je sum / days (dan bez reda = 0 postova),
+        za prosjeke/stope mean je prosjek ne-NULL vrijednosti u prozoru.
+        start/end: raspon report_date koji se vraca (granice ukljucive).
+        """
+        if days < 1:
+            raise ValueError("days must be >= 1")
+        if how not in ("sum", "mean"):
+            raise ValueError(f"Unsupported how={how!r}, expected 'sum' or 'mean'")
+        if sentiment is None and metric not in ADDITIVE_METRICS:
+            raise ValueError(f"metric={metric!r} is not additive across sentiments, pass a sentiment")
+
+        table = self.table()
+        if sentiment is not None:
+            # pylint: disable-next=no-member
+            daily = table.filter(pc.equal(table["sentiment"], sentiment)).select(["report_date", metric])
+        else:
+            daily = table.group_by("report_date").aggregate([(metric, "sum")])
+            daily = daily.select(["report_date", f"{metric}_sum"]).rename_columns(["report_date", metric])
+        daily = daily.sort_by("report_date")
+
+        dates = daily["report_date"].to_pylist()
+        out = rolling_window(dates, daily[metric].to_pylist(), days, how, additive=metric in ADDITIVE_METRICS)
+
+        result = pa.table({
+            "report_date": pa.array(dates, pa.date32()),
+            f"rolling_{days}d_{how}_{metric}": pa.array(out, pa.float64() if how == "mean" else daily[metric].type),
+        })
+
+        # filtriramo tek nakon racunanja da prvi dani u rasponu imaju puni prozor
+        return filter_dates(result, start, end)
+
+
+_CACHE: Optional[GoldCache] = None
+
+
+def get_cache() -> GoldCache:
+    global _CACHE  # pylint: disable=global-statement
+    if _CACHE is None:
+        _CACHE = GoldCache()
+    return _CACHE
+
+
+def main():
+    cache = get_cache()
+    reloaded = cache.refresh(force=False)
+
+    table = cache.table()
+    print("Reloaded from BigQuery:", reloaded)
+    print("Rows in cache:", table.num_rows)
+    print("Snapshot:", cache.snapshot_path)
+
+    rolling = cache.rolling("post_count", days=7)
+    print("Last 7 days (rolling_7d post_count):", rolling.slice(max(rolling.num_rows - 7, 0)).to_pylist())
+
+
+if __name__ == "__main__":
+    main()
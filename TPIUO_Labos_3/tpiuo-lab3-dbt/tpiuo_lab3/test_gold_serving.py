@@ -0,0 +1,213 @@
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pytest.importorskip("google.cloud.bigquery")
+
+import gold_serving  # pylint: disable=wrong-import-position
+
+
+def d(day: int) -> date:
+    return date(2025, 12, day)
+
+
+def ts(day: int) -> datetime:
+    return datetime(2025, 12, day, tzinfo=timezone.utc)
+
+
+GOLD = pa.table({
+    "report_date": pa.array([d(1), d(2), d(5), d(1), d(2), d(3)], pa.date32()),
+    "sentiment": ["POSITIVE"] * 3 + ["NEGATIVE"] * 3,
+    "post_count": pa.array([1, 2, 3, 10, 20, 30], pa.int64()),
+    "avg_hours_to_close": pa.array([1.0, 2.0, 3.0, 10.0, None, 20.0], pa.float64()),
+})
+
+
+class FakeClient:
+    """Stub za bigquery.Client: get_table().modified i query().to_arrow()."""
+
+    def __init__(self, table=GOLD, modified=ts(6)):
+        self.table = table
+        self.modified = modified
+        self.fail = False
+        self.queries = 0
+
+    def get_table(self, _table_id):
+        if self.fail:
+            raise RuntimeError("BigQuery unavailable")
+        return SimpleNamespace(modified=self.modified)
+
+    def query(self, _sql):
+        self.queries += 1
+        return SimpleNamespace(to_arrow=lambda: self.table)
+
+
+@pytest.fixture(name="snapshot_path")
+def fixture_snapshot_path(tmp_path):
+    return str(tmp_path / "gold_cache" / "gold.parquet")
+
+
+def make_cache(snapshot_path, client=None):
+    return gold_serving.GoldCache(client=client or FakeClient(), snapshot_path=snapshot_path, check_interval_s=0)
+
+
+def test_refresh_only_reloads_when_modified_changes(snapshot_path):
+    client = FakeClient()
+    cache = make_cache(snapshot_path, client)
+
+    assert cache.refresh() is True
+    assert cache.refresh() is False
+    assert client.queries == 1
+
+    client.modified = ts(7)
+    assert cache.refresh() is True
+    assert client.queries == 2
+
+
+def test_snapshot_round_trip_skips_query(snapshot_path):
+    make_cache(snapshot_path).refresh()
+
+    client = FakeClient()
+    cache = make_cache(snapshot_path, client)
+
+    assert cache.table().num_rows == GOLD.num_rows
+    assert client.queries == 0
+
+
+def test_corrupt_snapshot_is_ignored_and_rebuilt(snapshot_path, tmp_path):
+    (tmp_path / "gold_cache").mkdir()
+    with open(snapshot_path, "wb") as f:
+        f.write(b"not a parquet file")
+
+    client = FakeClient()
+    cache = make_cache(snapshot_path, client)
+
+    assert cache.table().num_rows == GOLD.num_rows
+    assert client.queries == 1
+    assert make_cache(snapshot_path).load_snapshot() is True
+
+
+def test_serves_stale_data_when_bigquery_fails(snapshot_path):
+    make_cache(snapshot_path).refresh()
+
+    client = FakeClient()
+    client.fail = True
+    cache = make_cache(snapshot_path, client)
+
+    assert cache.table().num_rows == GOLD.num_rows
+    assert cache.table().num_rows == GOLD.num_rows
+
+
+def test_raises_when_bigquery_fails_and_nothing_cached(snapshot_path):
+    client = FakeClient()
+    client.fail = True
+
+    with pytest.raises(RuntimeError):
+        make_cache(snapshot_path, client).table()
+
+
+def test_query_range_empty_sentiments_returns_nothing(snapshot_path):
+    cache = make_cache(snapshot_path)
+
+    assert cache.query_range(sentiments=[]).num_rows == 0
+
+
+def test_query_range_bounds_are_inclusive(snapshot_path):
+    cache = make_cache(snapshot_path)
+
+    result = cache.query_range(d(2), d(3), sentiments=["NEGATIVE"], columns=["report_date", "post_count"])
+
+    assert result.to_pylist() == [
+        {"report_date": d(2), "post_count": 20},
+        {"report_date": d(3), "post_count": 30},
+    ]
+
+
+def test_rolling_sum_uses_calendar_days(snapshot_path):
+    cache = make_cache(snapshot_path)
+
+    result = cache.rolling("post_count", days=3)
+
+    assert result["report_date"].to_pylist() == [d(1), d(2), d(3), d(5)]
+    assert result["rolling_3d_sum_post_count"].to_pylist() == [11, 33, 63, 33]
+    assert result["rolling_3d_sum_post_count"].type == pa.int64()
+
+
+def test_rolling_between_keeps_full_window(snapshot_path):
+    cache = make_cache(snapshot_path)
+
+    result = cache.rolling("post_count", days=3, start=d(3))
+
+    assert result["rolling_3d_sum_post_count"].to_pylist() == [63, 33]
+
+
+def test_rolling_mean_skips_nulls(snapshot_path):
+    cache = make_cache(snapshot_path)
+
+    result = cache.rolling("avg_hours_to_close", days=3, sentiment="NEGATIVE", how="mean")
+
+    assert result["rolling_3d_mean_avg_hours_to_close"].to_pylist() == [10.0, 10.0, 15.0]
+
+
+def test_rolling_sum_of_only_nulls_is_null(snapshot_path):
+    cache = make_cache(snapshot_path)
+
+    result = cache.rolling("avg_hours_to_close", days=1, sentiment="NEGATIVE")
+
+    assert result["rolling_1d_sum_avg_hours_to_close"].to_pylist() == [10.0, None, 20.0]
+
+
+def test_rolling_rejects_non_additive_metric_without_sentiment(snapshot_path):
+    cache = make_cache(snapshot_path)
+
+    with pytest.raises(ValueError):
+        cache.rolling("avg_hours_to_close", days=3)
+
+
+def test_rolling_empty_result_keeps_type(snapshot_path):
+    cache = make_cache(snapshot_path)
+
+    result = cache.rolling("post_count", days=3, sentiment="UNKNOWN")
+
+    assert result.num_rows == 0
+    assert result["rolling_3d_sum_post_count"].type == pa.int64()
+
+
+def test_snapshot_write_failure_does_not_fail_reads(tmp_path):
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("file, not a directory")
+    snapshot_path = str(blocker / "gold.parquet")
+
+    cache = make_cache(snapshot_path)
+
+    assert cache.table().num_rows == GOLD.num_rows
+    assert not (tmp_path / "not_a_dir" / "gold.parquet.tmp").exists()
+
+
+def test_snapshot_tmp_file_is_removed_on_failed_write(snapshot_path, tmp_path, monkeypatch):
+    def fail_replace(_src, _dst):
+        raise OSError("read-only")
+
+    monkeypatch.setattr(gold_serving.os, "replace", fail_replace)
+    cache = make_cache(snapshot_path)
+
+    assert cache.table().num_rows == GOLD.num_rows
+    assert not any((tmp_path / "gold_cache").iterdir())
+
+
+def test_rolling_mean_of_counts_treats_missing_days_as_zero(snapshot_path):
+    cache = make_cache(snapshot_path)
+
+    result = cache.rolling("post_count", days=3, sentiment="POSITIVE", how="mean")
+
+    assert result["report_date"].to_pylist() == [d(1), d(2), d(5)]
+    assert result["rolling_3d_mean_post_count"].to_pylist() == pytest.approx([1 / 3, 1.0, 1.0])
+
+
+def test_rolling_window_sums_each_window_exactly():
+    dates = [d(1), d(2), d(3), d(4)]
+
+    assert gold_serving.rolling_window(dates, [0.1, 0.2, 0.3, 0.0], 1, "sum") == [0.1, 0.2, 0.3, 0.0]
+    assert gold_serving.rolling_window(dates[:3], [1e17, 1.0, 1.0], 1, "sum") == [1e17, 1.0, 1.0]